@@ -3,9 +3,14 @@
 from __future__ import print_function, absolute_import
 
 import sys
+import copy
 import os.path as op
 import logging
-from optparse import OptionParser, OptionValueError
+from functools import lru_cache
+from importlib import import_module
+from collections import OrderedDict
+from argparse import ArgumentParser, ArgumentTypeError, HelpFormatter, \
+    Namespace
 
 from pyrocko import util, marker
 
@@ -15,11 +20,14 @@ logger = logging.getLogger('grond.main')
 km = 1e3
 
 
+d2u_table = str.maketrans('-', '_')
+
+
 def d2u(d):
     if isinstance(d, dict):
-        return dict((k.replace('-', '_'), v) for (k, v) in d.items())
+        return dict((k.translate(d2u_table), v) for (k, v) in d.items())
     else:
-        return d.replace('-', '_')
+        return d.translate(d2u_table)
 
 
 subcommand_descriptions = {
@@ -68,16 +76,13 @@ subcommand_usages = {
     'version': 'version',
 }
 
-subcommands = subcommand_descriptions.keys()
+subcommands = frozenset(subcommand_descriptions)
 
-program_name = 'grond'
-
-usage_tdata = d2u(subcommand_descriptions)
-usage_tdata['program_name'] = program_name
-usage_tdata['version_number'] = grond.__version__
+subcommand_d2u = dict((name, d2u(name)) for name in subcommands)
 
+program_name = 'grond'
 
-usage = '''%(program_name)s <subcommand> [options] [--] <arguments> ...
+usage_text = '''%(program_name)s <subcommand> [options] [--] <arguments> ...
 
 Grond is a probabilistic earthquake source inversion framework.
 
@@ -106,17 +111,27 @@ To get further help and a list of available options for any subcommand run:
     %(program_name)s <subcommand> --help
 
 What do you want to bust today?!
-''' % usage_tdata
+'''
+
 
+@lru_cache(maxsize=1)
+def get_usage():
+    usage_tdata = dict(
+        (subcommand_d2u[name], descr)
+        for (name, descr) in subcommand_descriptions.items())
+    usage_tdata['program_name'] = program_name
+    usage_tdata['version_number'] = grond.__version__
+    return usage_text % usage_tdata
 
-class CLIHints(object):
-    init = '''
+
+cli_hints = {
+    'init': '''
 We created a folder structure in {project_dir}.
 Check out the YAML configuration in {config} and start the optimisation by:
 
     grond go {config}
-'''
-    scenario = '''
+''',
+    'scenario': '''
 To start the scenario's optimisation, change to folder
 
     cd {project_dir}
@@ -124,120 +139,104 @@ To start the scenario's optimisation, change to folder
 Check out the YAML configuration in {config} and start the optimisation by:
 
     grond go {config}
-'''
-    report = '''
+''',
+    'report': '''
 To open the reports in your web browser, run
 
     grond report -s --open {config}
-'''
-    check = '''
+''',
+    'check': '''
 To start the optimisation, run
 
     grond go {config}
-'''
-    go = '''
+''',
+    'go': '''
 To look at the results, run
 
     grond report -so {rundir}
 '''
+}
 
-    def __new__(cls, command, **kwargs):
-        return 'Hint:\n' +\
-            getattr(cls, command).format(**kwargs)
 
+def cli_hint(command, **kwargs):
+    return 'Hint:\n' + cli_hints[command].format_map(kwargs)
 
-def main(args=None):
-    if not args:
-        args = sys.argv
 
-    args = list(sys.argv)
-    if len(args) < 2:
-        sys.exit('Usage: %s' % usage)
+def main(args=None):
+    argv = args if args is not None else sys.argv
+    if len(argv) < 2:
+        sys.exit('Usage: %s' % get_usage())
 
-    args.pop(0)
-    command = args.pop(0)
+    command = argv[1]
+    args = list(argv[2:])
 
-    if command in subcommands:
-        globals()['command_' + d2u(command)](args)
+    handler = subcommand_handlers.get(command)
+    if handler:
+        handler(args)
 
     elif command in ('--help', '-h', 'help'):
         if command == 'help' and args:
-            acommand = args[0]
-            if acommand in subcommands:
-                globals()['command_' + acommand](['--help'])
+            ahandler = subcommand_handlers.get(args[0])
+            if ahandler:
+                ahandler(['--help'])
 
-        sys.exit('Usage: %s' % usage)
+        sys.exit('Usage: %s' % get_usage())
 
     else:
         die('no such subcommand: %s' % command)
 
 
 def add_common_options(parser):
-    parser.add_option(
+    parser.add_argument(
         '--loglevel',
         action='store',
         dest='loglevel',
-        type='choice',
         choices=('critical', 'error', 'warning', 'info', 'debug'),
         default='info',
         help='set logger level to '
              '"critical", "error", "warning", "info", or "debug". '
-             'Default is "%default".')
+             'Default is "%(default)s".')
 
-    parser.add_option(
+    parser.add_argument(
         '--docs',
         dest='rst_docs',
         action='store_true')
 
 
-def print_docs(command, parser):
-
-    from optparse import IndentedHelpFormatter
+class DocsFormatter(HelpFormatter):
 
-    class DocsFormatter(IndentedHelpFormatter):
+    def start_section(self, heading):
+        self._add_item(self._format_heading, [heading])
 
-        def format_heading(self, heading):
-            return '%s\n%s\n\n' % (heading, '.'*len(heading))
-
-        def format_usage(self, usage):
-            lines = usage.splitlines()
-            return self.format_heading('Usage') + \
-                '.. code-block:: none\n\n%s' % '\n'.join(
-                    '    '+line.strip() for line in lines)
-
-        def format_option(self, option):
-            if not option.help:
-                return ''
-
-            result = []
-            opts = self.option_strings[option]
-            result.append('\n.. describe:: %s\n\n' % opts)
-
-            help_text = self.expand_default(option)
-            result.append('    %s\n\n' % help_text)
-
-            return ''.join(result)
-
-    parser.formatter = DocsFormatter()
-    parser.formatter.set_parser(parser)
-
-    def format_help(parser):
-        formatter = parser.formatter
-        result = []
+    def end_section(self):
+        pass
 
-        result.append(parser.format_description(formatter) + "\n")
+    def _format_heading(self, heading):
+        return '%s\n%s\n\n' % (heading, '.'*len(heading))
 
-        if parser.usage:
-            result.append(parser.get_usage() + "\n")
+    def _format_usage(self, usage, actions, groups, prefix):
+        lines = (usage % dict(prog=self._prog)).splitlines()
+        return self._format_heading('Usage') + \
+            '.. code-block:: none\n\n%s\n\n' % '\n'.join(
+                '    '+line.strip() for line in lines)
 
-        result.append('\n')
+    def _format_action(self, action):
+        if not action.help:
+            return ''
 
-        result.append(parser.format_option_help(formatter))
+        return '\n.. describe:: %s\n\n    %s\n\n' % (
+            self._format_action_invocation(action),
+            self._expand_help(action))
 
-        result.append('\n')
 
-        result.append(parser.format_epilog(formatter))
-        return "".join(result)
+def print_docs(command, parser):
+    formatter = DocsFormatter(parser.prog)
+    formatter.add_text(parser.description)
+    formatter.add_usage(parser.usage, parser._actions, [])
+    formatter.start_section('Options')
+    formatter.add_arguments(parser._optionals._group_actions)
+    formatter.end_section()
+    formatter.add_text(parser.epilog)
 
     print(command)
     print('-' * len(command))
@@ -246,7 +245,7 @@ def print_docs(command, parser):
     print()
     print('.. option:: %s' % command)
     print()
-    print(format_help(parser))
+    print(formatter.format_help())
 
 
 def process_common_options(command, parser, options):
@@ -256,31 +255,76 @@ def process_common_options(command, parser, options):
         exit(0)
 
 
-def cl_parse(command, args, setup=None, details=None):
+def parse_args(parser, args):
+    # Options may appear anywhere between the positional arguments.
+    # Everything after '--' is passed through as is.
+    args = list(args)
+    try:
+        isep = args.index('--')
+        args, extra_args = args[:isep], args[isep+1:]
+    except ValueError:
+        extra_args = []
+
+    options, args = parser.parse_known_args(args)
+    unknown = [arg for arg in args if arg.startswith('-') and arg != '-']
+    if unknown:
+        parser.error('unrecognized arguments: %s' % ' '.join(unknown))
+
+    options.args = args + extra_args
+    return options
+
+
+def make_parser(command, setup=None, details=None):
     usage = subcommand_usages[command]
     descr = subcommand_descriptions[command]
 
     if isinstance(usage, str):
         usage = [usage]
 
-    susage = '%s %s' % (program_name, usage[0])
-    for s in usage[1:]:
-        susage += '\n%s%s %s' % (' '*7, program_name, s)
+    lines = ['%s %s' % (program_name, usage[0])]
+    lines.extend('%s%s %s' % (' '*7, program_name, s) for s in usage[1:])
+    susage = '\n'.join(lines)
 
     description = descr[0].upper() + descr[1:] + '.'
 
     if details:
         description = description + '\n\n%s' % details
 
-    parser = OptionParser(usage=susage, description=description)
+    parser = ArgumentParser(
+        prog=program_name, usage=susage, description=description)
 
     if setup:
         setup(parser)
 
     add_common_options(parser)
-    (options, args) = parser.parse_args(args)
+    return parser
+
+
+cl_parse_cache = OrderedDict()
+cl_parse_cache_size = 32
+
+
+def cl_parse(command, args, setup=None, details=None):
+    # The setup function of a subcommand is recreated on every call, but
+    # its code object stays the same.
+    key = (command, tuple(args), details,
+           setup.__code__ if setup is not None else None)
+    try:
+        parser, options = cl_parse_cache[key]
+        cl_parse_cache.move_to_end(key)
+
+    except KeyError:
+        parser = make_parser(command, setup, details)
+        options = parse_args(parser, args)
+        if not options.rst_docs:
+            cl_parse_cache[key] = parser, options
+            if len(cl_parse_cache) > cl_parse_cache_size:
+                cl_parse_cache.popitem(last=False)
+
+    # Cached results are shared between calls, hand out a private copy.
+    options = Namespace(**copy.deepcopy(vars(options)))
     process_common_options(command, parser, options)
-    return parser, options, args
+    return parser, options, options.args
 
 
 def die(message, err=''):
@@ -296,29 +340,46 @@ def help_and_die(parser, message):
     die(message)
 
 
-def multiple_choice(option, opt_str, value, parser, choices):
-    options = value.split(',')
-    for opt in options:
-        if opt not in choices:
-            raise OptionValueError('invalid option %s - valid options are: %s'
-                                   % (opt, ', '.join(choices)))
-    setattr(parser.values, option.dest, options)
+_agg_backend_ensured = False
+
+
+def _ensure_agg_backend():
+    global _agg_backend_ensured
+    if not _agg_backend_ensured:
+        import matplotlib
+        matplotlib.use('Agg')
+        _agg_backend_ensured = True
 
 
-def magnitude_range(option, opt_str, value, parser):
-    mag_range = value.split('-')
-    if len(mag_range) != 2:
-        raise OptionValueError(
+def multiple_choice(choices):
+    valid_choices = frozenset(choices)
+
+    def parse(value):
+        options = value.split(',')
+        for opt in options:
+            if opt not in valid_choices:
+                raise ArgumentTypeError(
+                    'invalid option %s - valid options are: %s'
+                    % (opt, ', '.join(choices)))
+        return options
+
+    return parse
+
+
+def magnitude_range(value):
+    mag_min, sep, mag_max = value.partition('-')
+    if not sep or '-' in mag_max:
+        raise ArgumentTypeError(
             'invalid magnitude %s - valid range is e.g. 6-7' % value)
     try:
-        mag_range = tuple(map(float, mag_range))
+        mag_range = float(mag_min), float(mag_max)
     except ValueError:
-        raise OptionValueError('magnitudes must be numbers.')
+        raise ArgumentTypeError('magnitudes must be numbers.')
 
     if mag_range[0] > mag_range[1]:
-        raise OptionValueError('minimum magnitude must be larger than'
-                               ' maximum magnitude.')
-    setattr(parser.values, option.dest, mag_range)
+        raise ArgumentTypeError('minimum magnitude must be larger than'
+                                ' maximum magnitude.')
+    return mag_range
 
 
 def command_scenario(args):
@@ -327,56 +388,54 @@ def command_scenario(args):
     STORE_WAVEFORMS = 'crust2_ib'
 
     def setup(parser):
-        parser.add_option(
-            '--targets', action='callback', dest='targets', type=str,
-            callback=multiple_choice, callback_kwargs={
-                'choices': ('waveforms', 'gnss', 'insar')
-            },
+        parser.add_argument(
+            '--targets', dest='targets',
+            type=multiple_choice(('waveforms', 'gnss', 'insar')),
             default='waveforms',
             help='forward modelling targets for the scenario. Select from:'
                  ' waveforms, gnss and insar. '
-                 '(default: --targets=%default,'
+                 '(default: --targets=%(default)s,'
                  ' multiple selection by --targets=waveforms,gnss,insar)')
-        parser.add_option(
+        parser.add_argument(
             '--problem', dest='problem', default='cmt',
-            type='choice', choices=['cmt', 'rectangular'],
+            choices=['cmt', 'rectangular'],
             help='problem to generate: \'dc\' (double couple)'
                  ' or \'rectangular\' (rectangular finite fault)'
-                 ' (default: \'%default\')')
-        parser.add_option(
-            '--magnitude-range', dest='magnitude_range', type=str,
-            action='callback', callback=magnitude_range, default=[6.0, 7.0],
-            help='Magnitude range min_mag-max_mag (default: %default)')
-        parser.add_option(
+                 ' (default: \'%(default)s\')')
+        parser.add_argument(
+            '--magnitude-range', dest='magnitude_range',
+            type=magnitude_range, default=(6.0, 7.0),
+            help='Magnitude range min_mag-max_mag (default: %(default)s)')
+        parser.add_argument(
             '--nstations', dest='nstations', type=int, default=20,
-            help='number of seismic stations to create (default: %default)')
-        parser.add_option(
+            help='number of seismic stations to create (default: %(default)s)')
+        parser.add_argument(
             '--gnss_nstations', dest='gnss_nstations', type=int, default=20,
             help='number of GNSS campaign stations to create'
-                 ' (default: %default)')
-        parser.add_option(
+                 ' (default: %(default)s)')
+        parser.add_argument(
             '--nevents', dest='nevents', type=int, default=1,
-            help='number of events to create (default: %default)')
-        parser.add_option(
+            help='number of events to create (default: %(default)s)')
+        parser.add_argument(
             '--lat', dest='lat', type=float, default=41.0,
-            help='center latitude of the scenario (default: %default)')
-        parser.add_option(
+            help='center latitude of the scenario (default: %(default)s)')
+        parser.add_argument(
             '--lon', dest='lon', type=float, default=33.3,
-            help='center latitude of the scenario (default: %default)')
-        parser.add_option(
+            help='center latitude of the scenario (default: %(default)s)')
+        parser.add_argument(
             '--radius', dest='radius', type=float, default=200.,
-            help='radius of the the scenario in [km] (default: %default)')
-        parser.add_option(
+            help='radius of the the scenario in [km] (default: %(default)s)')
+        parser.add_argument(
             '--gf-waveforms', dest='store_waveforms', type=str,
             default=STORE_WAVEFORMS,
             help='Green\'s function store for waveform modelling, '
-                 '(default: %default)')
-        parser.add_option(
+                 '(default: %(default)s)')
+        parser.add_argument(
             '--gf-static', dest='store_statics', type=str,
             default=STORE_STATIC,
             help='Green\'s function store for static modelling, '
-                 '(default: %default)')
-        parser.add_option(
+                 '(default: %(default)s)')
+        parser.add_argument(
             '--force', dest='force', action='store_true',
             help='overwrite existing project folder.')
 
@@ -423,7 +482,7 @@ def command_scenario(args):
         scenario.set_problem(problem)
 
         scenario.build(force=options.force, interactive=True)
-        logger.info(CLIHints('scenario',
+        logger.info(cli_hint('scenario',
                              config=scenario.get_grond_config_path(),
                              project_dir=project_dir))
 
@@ -436,26 +495,24 @@ def command_init(args):
     from . import cmd_init as init
 
     def setup(parser):
-        parser.add_option(
-            '--targets', action='callback', dest='targets', type=str,
-            callback=multiple_choice, callback_kwargs={
-                'choices': ('waveforms', 'gnss', 'insar')
-            },
+        parser.add_argument(
+            '--targets', dest='targets',
+            type=multiple_choice(('waveforms', 'gnss', 'insar')),
             default='waveforms',
             help='select from:'
                  ' waveforms, gnss and insar. '
-                 '(default: --targets=%default,'
+                 '(default: --targets=%(default)s,'
                  ' multiple selection by --targets=waveform,gnss,insar)')
-        parser.add_option(
+        parser.add_argument(
             '--problem', dest='problem', default='cmt',
-            type='choice', choices=['cmt', 'rectangular'],
+            choices=['cmt', 'rectangular'],
             help='problem to generate: \'dc\' (double couple)'
                  ' or\'rectangular\' (rectangular finite fault)'
-                 ' (default: \'%default\')')
-        parser.add_option(
+                 ' (default: \'%(default)s\')')
+        parser.add_argument(
             '--full', dest='full', action='store_true',
             help='create a full configuration, from targets above')
-        parser.add_option(
+        parser.add_argument(
             '--force', dest='force', action='store_true',
             help='overwrite existing project folder')
 
@@ -490,7 +547,7 @@ def command_init(args):
         if len(args) == 1:
             project_dir = args[0]
             project.build(project_dir, options.force)
-            logger.info(CLIHints(
+            logger.info(cli_hint(
                 'init', project_dir=project_dir,
                 config=op.join(project_dir, 'config', 'config.gronf')))
         else:
@@ -524,17 +581,17 @@ def command_check(args):
     from grond.environment import Environment
 
     def setup(parser):
-        parser.add_option(
+        parser.add_argument(
             '--target-ids', dest='target_string_ids', metavar='TARGET_IDS',
             help='process only selected targets. TARGET_IDS is a '
                  'comma-separated list of target IDs. Target IDs have the '
                  'form SUPERGROUP.GROUP.NETWORK.STATION.LOCATION.CHANNEL.')
 
-        parser.add_option(
+        parser.add_argument(
             '--waveforms', dest='show_waveforms', action='store_true',
             help='show raw, restituted, projected, and processed waveforms')
 
-        parser.add_option(
+        parser.add_argument(
             '--nrandom', dest='n_random_synthetics', metavar='N', type=int,
             default=10,
             help='set number of random synthetics to forward model (default: '
@@ -557,7 +614,7 @@ def command_check(args):
             target_string_ids=target_string_ids,
             show_waveforms=options.show_waveforms,
             n_random_synthetics=options.n_random_synthetics)
-        logger.info(CLIHints('check', config=env.get_config_path()))
+        logger.info(cli_hint('check', config=env.get_config_path()))
 
     except grond.GrondError as e:
         die(str(e))
@@ -568,18 +625,18 @@ def command_go(args):
     from grond.environment import Environment
 
     def setup(parser):
-        parser.add_option(
+        parser.add_argument(
             '--force', dest='force', action='store_true',
             help='overwrite existing run directory')
-        parser.add_option(
+        parser.add_argument(
             '--preserve', dest='preserve', action='store_true',
             help='preserve old rundir')
-        parser.add_option(
+        parser.add_argument(
             '--status', dest='status', default='state',
-            type='choice', choices=['state', 'quiet'],
+            choices=['state', 'quiet'],
             help='status output selection (choices: state, quiet, default: '
                  'state)')
-        parser.add_option(
+        parser.add_argument(
             '--parallel', dest='nparallel', type=int, default=1,
             help='set number of events to process in parallel, '
                  'If set to more than one, --status=quiet is implied.')
@@ -600,7 +657,7 @@ def command_go(args):
             status=status,
             nparallel=options.nparallel)
         if len(env.get_selected_event_names()) == 1:
-            logger.info(CLIHints(
+            logger.info(cli_hint(
                 'go', rundir=env.get_rundir_path()))
 
     except grond.GrondError as e:
@@ -628,13 +685,14 @@ def command_forward(args):
 
 def command_harvest(args):
     def setup(parser):
-        parser.add_option(
+        parser.add_argument(
             '--force', dest='force', action='store_true',
             help='overwrite existing harvest directory')
-        parser.add_option(
+        parser.add_argument(
             '--neach', dest='neach', type=int, default=10,
-            help='take NEACH best samples from each chain (default: %default)')
-        parser.add_option(
+            help='take NEACH best samples from each chain '
+                 '(default: %(default)s)')
+        parser.add_argument(
             '--weed', dest='weed', type=int, default=0,
             help='weed out bootstrap samples with bad global performance. '
                  '0: no weeding (default), '
@@ -662,9 +720,6 @@ def command_harvest(args):
 
 def command_plot(args):
 
-    import matplotlib
-    matplotlib.use('Agg')
-
     from grond.environment import Environment
 
     def setup(parser):
@@ -678,6 +733,8 @@ def command_plot(args):
         help_and_die(parser, 'two or three arguments required')
 
     env = Environment(args[1:])
+
+    _ensure_agg_backend()
     from grond import plot
     if args[0] == 'list':
         plot_names, plot_doc = zip(*[(pc.name, pc.__doc__)
@@ -708,9 +765,6 @@ def command_plot(args):
 
 def command_movie(args):
 
-    import matplotlib
-    matplotlib.use('Agg')
-
     def setup(parser):
         pass
 
@@ -721,6 +775,7 @@ def command_movie(args):
 
     run_path, xpar_name, ypar_name, movie_filename_template = args
 
+    _ensure_agg_backend()
     from grond import plot
 
     movie_filename = movie_filename_template % {
@@ -737,13 +792,13 @@ def command_movie(args):
 def command_export(args):
 
     def setup(parser):
-        parser.add_option(
+        parser.add_argument(
             '--type', dest='type', metavar='TYPE',
             choices=('event', 'event-yaml', 'source', 'vector'),
             help='select type of objects to be exported. Choices: '
                  '"event" (default), "event-yaml", "source", "vector".')
 
-        parser.add_option(
+        parser.add_argument(
             '--parameters', dest='parameters', metavar='PLIST',
             help='select parameters to be exported. PLIST is a '
                  'comma-separated list where each entry has the form '
@@ -751,7 +806,7 @@ def command_export(args):
                  '"mean", "std", "minimum", "percentile16", "median", '
                  '"percentile84", "maximum".')
 
-        parser.add_option(
+        parser.add_argument(
             '--output', dest='filename', metavar='FILE',
             help='write output to FILE')
 
@@ -790,64 +845,61 @@ def command_export(args):
 
 def command_report(args):
 
-    import matplotlib
-    matplotlib.use('Agg')
-
     from grond.environment import Environment
     from grond.report import \
         report, report_index, serve_ip, serve_report, read_config, \
         write_config, ReportConfig
 
     def setup(parser):
-        parser.add_option(
+        parser.add_argument(
             '--index-only',
             dest='index_only',
             action='store_true',
             help='create index only')
-        parser.add_option(
+        parser.add_argument(
             '--serve', '-s',
             dest='serve',
             action='store_true',
             help='start http service')
-        parser.add_option(
+        parser.add_argument(
             '--serve-external', '-S',
             dest='serve_external',
             action='store_true',
             help='shortcut for --serve --host=default --fixed-port')
-        parser.add_option(
+        parser.add_argument(
             '--host',
             dest='host',
             default='localhost',
             help='<ip> to start the http server on. Special values for '
                  '<ip>: "*" binds to all available interfaces, "default" '
                  'to default external interface, "localhost" to "127.0.0.1".')
-        parser.add_option(
+        parser.add_argument(
             '--port',
             dest='port',
             type=int,
             default=8383,
             help='set default http server port. Will count up if port is '
                  'already in use unless --fixed-port is given.')
-        parser.add_option(
+        parser.add_argument(
             '--fixed-port',
             dest='fixed_port',
             action='store_true',
             help='fail if port is already in use')
-        parser.add_option(
+        parser.add_argument(
             '--open', '-o',
             dest='open',
             action='store_true',
             help='open report in browser')
-        parser.add_option(
+        parser.add_argument(
             '--config',
             dest='config',
             help='report configuration file to use')
-        parser.add_option(
+        parser.add_argument(
             '--write-config',
             dest='write_config',
             metavar='FILE',
             help='write configuration (or default configuration) to FILE')
-        parser.add_option(
+        parser.add_argument(
             '--update-without-plotting',
             dest='update_without_plotting',
             action='store_true',
@@ -888,6 +940,9 @@ def command_report(args):
 
     reports_generated = False
 
+    if args and not options.update_without_plotting:
+        _ensure_agg_backend()
+
     if args and all(op.isdir(rundir) for rundir in args):
         rundirs = args
         all_failed = True
@@ -945,51 +1000,51 @@ def command_report(args):
             logger.info('nothing to do, see: grond report --help')
 
     if reports_generated and not (options.serve or options.serve_external):
-        logger.info(CLIHints('report', config=s_conf))
+        logger.info(cli_hint('report', config=s_conf))
 
 
 def command_qc_polarization(args):
 
     def setup(parser):
-        parser.add_option(
+        parser.add_argument(
             '--time-factor-pre', dest='time_factor_pre', type=float,
             metavar='NUMBER',
             default=0.5,
             help='set duration to extract before synthetic P phase arrival, '
                  'relative to 1/fmin. fmin is taken from the selected target '
-                 'group in the config file (default=%default)')
-        parser.add_option(
+                 'group in the config file (default=%(default)s)')
+        parser.add_argument(
             '--time-factor-post', dest='time_factor_post', type=float,
             metavar='NUMBER',
             default=0.5,
             help='set duration to extract after synthetic P phase arrival, '
                  'relative to 1/fmin. fmin is taken from the selected target '
-                 'group in the config file (default=%default)')
-        parser.add_option(
+                 'group in the config file (default=%(default)s)')
+        parser.add_argument(
             '--distance-min', dest='distance_min', type=float,
             metavar='NUMBER',
             help='minimum event-station distance [m]')
-        parser.add_option(
+        parser.add_argument(
             '--distance-max', dest='distance_max', type=float,
             metavar='NUMBER',
             help='maximum event-station distance [m]')
-        parser.add_option(
+        parser.add_argument(
             '--depth-min', dest='depth_min', type=float,
             metavar='NUMBER',
             help='minimum station depth [m]')
-        parser.add_option(
+        parser.add_argument(
             '--depth-max', dest='depth_max', type=float,
             metavar='NUMBER',
             help='maximum station depth [m]')
-        parser.add_option(
+        parser.add_argument(
             '--picks', dest='picks_filename',
             metavar='FILENAME',
             help='add file with P picks in Snuffler marker format')
-        parser.add_option(
+        parser.add_argument(
             '--save', dest='output_filename',
             metavar='FILENAME.FORMAT',
             help='save output to file FILENAME.FORMAT')
-        parser.add_option(
+        parser.add_argument(
             '--dpi', dest='output_dpi', type=float, default=120.,
             metavar='NUMBER',
             help='DPI setting for raster formats (default=120)')
@@ -999,8 +1054,7 @@ def command_qc_polarization(args):
         help_and_die(parser, 'missing arguments')
 
     if options.output_filename:
-        import matplotlib
-        matplotlib.use('Agg')
+        _ensure_agg_backend()
 
     import grond.qc
 
@@ -1020,12 +1074,11 @@ def command_qc_polarization(args):
         markers = marker.load_markers(options.picks_filename)
         marker.associate_phases_to_events(markers)
 
-        nsl_to_time = {}
-        for m in markers:
-            if isinstance(m, marker.PhaseMarker):
-                ev = m.get_event()
-                if ev is not None and ev.name == event_name:
-                    nsl_to_time[m.one_nslc()[:3]] = m.tmin
+        nsl_to_time = dict(
+            (m.one_nslc()[:3], m.tmin) for m in markers
+            if isinstance(m, marker.PhaseMarker)
+            for ev in (m.get_event(),)
+            if ev is not None and ev.name == event_name)
 
         if not nsl_to_time:
             help_and_die(
@@ -1067,7 +1120,7 @@ def command_qc_polarization(args):
 
 def command_upgrade_config(args):
     def setup(parser):
-        parser.add_option(
+        parser.add_argument(
             '--diff', dest='diff', action='store_true',
             help='create diff between normalized old and new versions')
 
@@ -1093,7 +1146,7 @@ def command_diff(args):
 
 def command_version(args):
     def setup(parser):
-        parser.add_option(
+        parser.add_argument(
             '--short', dest='short', action='store_true',
             help='only print Grond\'s version number')
 
@@ -1105,29 +1158,18 @@ def command_version(args):
 
     print("grond: %s" % grond.__version__)
 
-    try:
-        import pyrocko
-        print('pyrocko: %s' % pyrocko.long_version)
-    except ImportError:
-        print('pyrocko: N/A')
+    for module_name, version_attribute in [
+            ('pyrocko', 'long_version'),
+            ('numpy', '__version__'),
+            ('scipy', '__version__'),
+            ('matplotlib', '__version__')]:
 
-    try:
-        import numpy
-        print('numpy: %s' % numpy.__version__)
-    except ImportError:
-        print('numpy: N/A')
-
-    try:
-        import scipy
-        print('scipy: %s' % scipy.__version__)
-    except ImportError:
-        print('scipy: N/A')
-
-    try:
-        import matplotlib
-        print('matplotlib: %s' % matplotlib.__version__)
-    except ImportError:
-        print('matplotlib: N/A')
+        try:
+            module = import_module(module_name)
+            print('%s: %s' % (
+                module_name, getattr(module, version_attribute)))
+        except ImportError:
+            print('%s: N/A' % module_name)
 
     try:
         from pyrocko.gui.qt_compat import Qt
@@ -1137,9 +1179,13 @@ def command_version(args):
         print('PyQt: N/A')
         print('Qt: N/A')
 
-    import sys
     print('python: %s.%s.%s' % sys.version_info[:3])
 
 
+subcommand_handlers = dict(
+    (name, globals()['command_' + subcommand_d2u[name]])
+    for name in subcommands)
+
+
 if __name__ == '__main__':
     main()
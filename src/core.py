@@ -30,21 +30,6 @@ logger = logging.getLogger('grond.core')
 guts_prefix = 'grond'
 
 
-class RingBuffer(num.ndarray):
-    def __new__(cls, *args, **kwargs):
-        cls = num.ndarray.__new__(cls, *args, **kwargs)
-        cls.fill(0.)
-        return cls
-
-    def __init__(self, *args, **kwargs):
-        self.pos = 0
-
-    def put(self, value):
-        self[self.pos] = value
-        self.pos += 1
-        self.pos %= self.size
-
-
 def mahalanobis_distance(xs, mx, cov):
     imask = num.diag(cov) != 0.
     icov = num.linalg.inv(cov[imask, :][:, imask])
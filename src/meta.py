@@ -138,6 +138,16 @@ class Parameter(Object):
 
         Object.__init__(self, **kwargs)
 
+    def clone(self):
+        parameter = self.__class__(
+            name=self._name,
+            unit=self.unit,
+            scale_factor=self.scale_factor,
+            scale_unit=self.scale_unit,
+            label=self.label)
+        parameter.set_groups(list(self.groups))
+        return parameter
+
     def get_label(self, with_unit=True):
         lbl = [self.label or self.name]
         if with_unit:
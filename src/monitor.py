@@ -4,7 +4,6 @@ import time
 import logging
 import threading
 import os.path as op
-import numpy as num
 from datetime import timedelta
 
 from pyrocko import util, guts
@@ -14,21 +13,6 @@ from grond.environment import Environment
 logger = logging.getLogger('grond.monit')
 
 
-class RingBuffer(num.ndarray):
-    def __new__(cls, *args, **kwargs):
-        cls = num.ndarray.__new__(cls, *args, **kwargs)
-        cls.fill(0.)
-        return cls
-
-    def __init__(self, *args, **kwargs):
-        self.pos = 0
-
-    def put(self, value):
-        self[self.pos] = value
-        self.pos += 1
-        self.pos %= self.size
-
-
 class color:
     PURPLE = '\033[95m'
     CYAN = '\033[96m'
@@ -71,6 +55,7 @@ class TerminalMonitor(object):
 class GrondMonitor(threading.Thread):
 
     col_width = 15
+    ips_smoothing = 0.1
     row_name = color.BOLD + '{:<{col_param_width}s}' + color.END
     parameter_fmt = '{:{col_width}s}'
 
@@ -79,9 +64,11 @@ class GrondMonitor(threading.Thread):
         self.rundir = rundir
 
         self.sig_terminate = threading.Event()
-        self.iter_per_second = 0
+        self.starttime = time.time()
+        self.last_update = self.starttime
+        self.niter = 0
+        self.iter_per_second = 0.
         self._iiter = 0
-        self._iter_buffer = RingBuffer(20)
         self._tm = None
 
     def run(self):
@@ -125,8 +112,10 @@ class GrondMonitor(threading.Thread):
     @iiter.setter
     def iiter(self, iiter):
         dt = time.time() - self.last_update
-        self._iter_buffer.put(float((iiter - self.iiter) / dt))
-        self.iter_per_second = float(self._iter_buffer.mean())
+        # exponential moving average, comparable to a 20 sample mean
+        self.iter_per_second += \
+            self.ips_smoothing * ((iiter - self.iiter) / dt
+                                  - self.iter_per_second)
         self._iiter = iiter
         self.last_update = time.time()
 
@@ -82,7 +82,9 @@ class PlotCollectionManager(object):
     def dump_collection(self):
         path = self.path_collection()
         util.ensuredirs(path)
-        guts.dump(self._collection, filename=path)
+        path_tmp = path + '.tmp'
+        guts.dump(self._collection, filename=path_tmp)
+        os.replace(path_tmp, path)
 
     def path_collection(self):
         return op.join(self._path, 'plot_collection.yaml')
@@ -130,8 +132,7 @@ class PlotCollectionManager(object):
         group_ref = (group.name, group.variant)
         if group_ref in self._collection.group_refs:
             self._collection.group_refs.remove(group_ref)
-
-        self.dump_collection()
+            self.dump_collection()
 
         for item, fig in iter_item_figure:
             group.items.append(item)
@@ -168,8 +169,7 @@ class PlotCollectionManager(object):
         group_ref = (group.name, group.variant)
         if group_ref in self._collection.group_refs:
             self._collection.group_refs.remove(group_ref)
-
-        self.dump_collection()
+            self.dump_collection()
 
         for item, automap in iter_item_figure:
             group.items.append(item)
@@ -198,7 +198,7 @@ class PlotCollectionManager(object):
                 path = self.path_image(group, item, format)
                 try:
                     os.unlink(path)
-                except OSError:
+                except FileNotFoundError:
                     pass
 
         os.unlink(path_group)
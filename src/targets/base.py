@@ -1,5 +1,3 @@
-import copy
-
 import numpy as num
 
 from pyrocko import gf
@@ -84,8 +82,6 @@ class MisfitTarget(Object):
         self._target_parameters = None
         self._target_ranges = None
 
-        self._combined_weight = None
-
     @classmethod
     def get_plot_classes(cls):
         return []
@@ -109,7 +105,7 @@ class MisfitTarget(Object):
     @property
     def target_parameters(self):
         if self._target_parameters is None:
-            self._target_parameters = copy.deepcopy(self.parameters)
+            self._target_parameters = [p.clone() for p in self.parameters]
             for p in self._target_parameters:
                 p.set_groups([self.string_id()])
         return self._target_parameters
@@ -1,4 +1,6 @@
 import logging
+from types import MappingProxyType
+
 import numpy as num
 
 from pyrocko import gf
@@ -52,30 +54,31 @@ class SatelliteTargetGroup(TargetGroup):
         logger.debug('Selecting satellite targets...')
         targets = []
 
+        scene_ids = set(self.kite_scenes or ())
+        select_all = '*all' in scene_ids
+
         for scene in ds.get_kite_scenes():
-            if scene.meta.scene_id not in self.kite_scenes and\
-               '*all' not in self.kite_scenes:
+            if not select_all and scene.meta.scene_id not in scene_ids:
                 continue
 
             qt = scene.quadtree
+            focal_points = qt.leaf_focal_points
 
-            lats = num.empty(qt.nleaves)
-            lons = num.empty(qt.nleaves)
-            lats.fill(qt.frame.llLat)
-            lons.fill(qt.frame.llLon)
+            lats = num.full(qt.nleaves, qt.frame.llLat)
+            lons = num.full(qt.nleaves, qt.frame.llLon)
 
             if qt.frame.isDegree():
                 logger.debug('Target %s is referenced in degree'
                              % scene.meta.scene_id)
-                lons += qt.leaf_focal_points[:, 0]
-                lats += qt.leaf_focal_points[:, 1]
+                lons += focal_points[:, 0]
+                lats += focal_points[:, 1]
                 east_shifts = num.zeros_like(lats)
                 north_shifts = num.zeros_like(lats)
             elif qt.frame.isMeter():
                 logger.debug('Target %s is referenced in meter'
                              % scene.meta.scene_id)
-                east_shifts = qt.leaf_focal_points[:, 0]
-                north_shifts = qt.leaf_focal_points[:, 1]
+                east_shifts = num.ascontiguousarray(focal_points[:, 0])
+                north_shifts = num.ascontiguousarray(focal_points[:, 1])
             else:
                 assert False
 
@@ -140,16 +143,25 @@ class SatelliteMisfitTarget(gf.SatelliteTarget, MisfitTarget):
             self.parameters = self.available_parameters
 
         self.parameter_values = {}
+        self._scene = None
+        self._leaf_center_distance = None
+        self._ramp_buffer = None
+        self._misfit_buffer = None
 
     @property
     def target_ranges(self):
-        return self.misfit_config.ranges
+        # read-only, the ranges are shared by all targets of the group
+        return MappingProxyType(self.misfit_config.ranges)
 
     def string_id(self):
         return '.'.join([self.path, self.scene_id])
 
     def set_dataset(self, ds):
         MisfitTarget.set_dataset(self, ds)
+        self._scene = None
+        self._leaf_center_distance = None
+        self._ramp_buffer = None
+        self._misfit_buffer = None
 
     @property
     def nmisfits(self):
@@ -157,7 +169,9 @@ class SatelliteMisfitTarget(gf.SatelliteTarget, MisfitTarget):
 
     @property
     def scene(self):
-        return self._ds.get_kite_scene(self.scene_id)
+        if self._scene is None:
+            self._scene = self._ds.get_kite_scene(self.scene_id)
+        return self._scene
 
     def post_process(self, engine, source, statics):
         """Applies the objective function.
@@ -165,34 +179,47 @@ class SatelliteMisfitTarget(gf.SatelliteTarget, MisfitTarget):
         As a result the weighted misfits are given and the observed and
         synthetic data. For the satellite target the orbital ramp is
         calculated and applied here."""
-        scene = self.scene
-        quadtree = scene.quadtree
-
+        quadtree = self.scene.quadtree
         obs = quadtree.leaf_medians
 
         if self.misfit_config.optimise_orbital_ramp:
-            stat_level = num.full_like(obs, self.parameter_values['offset'])
+            ramp = (self.parameter_values['ramp_east'],
+                    self.parameter_values['ramp_north'])
 
-            stat_level += (quadtree.leaf_center_distance[:, 0]
-                           * self.parameter_values['ramp_east'])
-            stat_level += (quadtree.leaf_center_distance[:, 1]
-                           * self.parameter_values['ramp_north'])
+            if self._leaf_center_distance is None:
+                # contiguous east/north columns, avoids a copy in num.dot
+                self._leaf_center_distance = num.ascontiguousarray(
+                    quadtree.leaf_center_distance[:, :2])
+
+            if self._ramp_buffer is None:
+                self._ramp_buffer = num.empty(self.nmisfits)
+
+            stat_level = num.dot(
+                self._leaf_center_distance, ramp, out=self._ramp_buffer)
+            stat_level += self.parameter_values['offset']
             statics['displacement.los'] += stat_level
 
         stat_syn = statics['displacement.los']
 
-        res = obs - stat_syn
+        if self._result_mode == 'sparse':
+            # sparse results are copied out by the problem right away
+            if self._misfit_buffer is None:
+                self._misfit_buffer = num.empty((self.nmisfits, 2))
+                self._misfit_buffer[:, 1] = obs
+
+            mf = self._misfit_buffer
+        else:
+            mf = num.empty((self.nmisfits, 2))
+            mf[:, 1] = obs
 
-        misfit_value = res
-        misfit_norm = obs
+        num.subtract(obs, stat_syn, out=mf[:, 0])
 
-        mf = num.vstack([misfit_value, misfit_norm]).T
         result = SatelliteMisfitResult(
             misfits=mf)
 
         if self._result_mode == 'full':
             result.statics_syn = statics
-            result.statics_obs = quadtree.leaf_medians
+            result.statics_obs = obs
 
         return result
 
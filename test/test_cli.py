@@ -0,0 +1,86 @@
+import nose.tools as t
+
+from grond.apps import grond as main
+
+
+def _setup_parser(parser):
+    parser.add_argument(
+        '--force', dest='force', action='store_true')
+    parser.add_argument(
+        '--targets', dest='targets',
+        type=main.multiple_choice(('waveforms', 'gnss', 'insar')),
+        default='waveforms')
+    parser.add_argument(
+        '--magnitude-range', dest='magnitude_range',
+        type=main.magnitude_range, default=(6.0, 7.0))
+
+
+def parse(args):
+    return main.cl_parse('go', args, _setup_parser)[1:]
+
+
+def test_intermixed_args():
+    options, args = parse(['a', '--force', 'b', '--targets=gnss,insar', 'c'])
+    assert options.force
+    assert options.targets == ['gnss', 'insar']
+    assert options.magnitude_range == (6.0, 7.0)
+    assert args == ['a', 'b', 'c']
+
+
+def test_separator():
+    options, args = parse(['--', '-x'])
+    assert not options.force
+    assert args == ['-x']
+
+    options, args = parse(['--force', '--', '-x', 'y'])
+    assert options.force
+    assert args == ['-x', 'y']
+
+    options, args = parse(['a', '--', '--force'])
+    assert not options.force
+    assert args == ['a', '--force']
+
+
+def test_unknown_options():
+    for bad in (['--bogus'], ['a', '-x', 'b'], ['--forc3']):
+        with t.assert_raises(SystemExit):
+            parse(bad)
+
+    options, args = parse(['-', 'b'])
+    assert args == ['-', 'b']
+
+
+def test_converters():
+    options, args = parse(['--magnitude-range', '5.5-6', 'config.gronf'])
+    assert options.targets == ['waveforms']
+    assert options.magnitude_range == (5.5, 6.0)
+    assert args == ['config.gronf']
+
+    for bad in (['--targets=gnss,foo'],
+                ['--magnitude-range=6'],
+                ['--magnitude-range=7-6'],
+                ['--magnitude-range=a-b']):
+
+        with t.assert_raises(SystemExit):
+            parse(bad)
+
+
+def test_cache():
+    options, args = parse(['--targets=gnss', 'a'])
+    options.targets.append('insar')
+    args.append('b')
+
+    options, args = parse(['--targets=gnss', 'a'])
+    assert options.targets == ['gnss']
+    assert args == ['a']
+
+    def setup_other(parser):
+        parser.add_argument('--other', dest='other', action='store_true')
+
+    options, args = parse(['a'])
+    assert options.targets == ['waveforms']
+
+    options, args = main.cl_parse('go', ['a'], setup_other)[1:]
+    assert not options.other
+    assert not hasattr(options, 'targets')
+    assert args == ['a']